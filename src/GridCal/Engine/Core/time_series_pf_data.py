@@ -270,25 +270,30 @@ class TimeCircuit:
         :return: Array of power injections
         """
 
-        # load
-        Sbus = - self.C_bus_load * (self.load_s * self.load_active).T  # MW
-
-        # static generators
-        Sbus += self.C_bus_static_generator * (self.static_generator_s * self.static_generator_active).T  # MW
-
-        # generators
-        Sbus += self.C_bus_gen * (self.get_generator_injections() * self.generator_active).T
-
-        # battery
-        Sbus += self.C_bus_batt * (self.get_battery_injections() * self.battery_active).T
+        # connectivity of every injection device (the loads with negative sign), to do a single product
+        C_bus_dev = [-self.C_bus_load,
+                     self.C_bus_static_generator,
+                     self.C_bus_gen,
+                     self.C_bus_batt]
+
+        # power of every injection device: load, static generators, generators and batteries (time, devices) MW
+        S_dev = [self.load_s * self.load_active,
+                 self.static_generator_s * self.static_generator_active,
+                 self.get_generator_injections() * self.generator_active,
+                 self.get_battery_injections() * self.battery_active]
 
         # HVDC forced power
         if self.nhvdc:
-            Sbus += ((self.hvdc_active * self.hvdc_Pf) * self.C_hvdc_bus_f).T
-            Sbus += ((self.hvdc_active * self.hvdc_Pt) * self.C_hvdc_bus_t).T
+            C_bus_dev += [self.C_hvdc_bus_f.T, self.C_hvdc_bus_t.T]
+            S_dev += [self.hvdc_active * self.hvdc_Pf, self.hvdc_active * self.hvdc_Pt]
+
+        C_bus_dev = sp.hstack(C_bus_dev).tocsr()
 
         if normalize:
-            Sbus /= self.Sbase
+            # fold the normalization into the connectivity, which only scales its nonzeros
+            C_bus_dev = C_bus_dev * (1.0 / self.Sbase)
+
+        Sbus = C_bus_dev * np.hstack(S_dev).T
 
         return Sbus
 
@@ -687,25 +692,7 @@ class TimeCircuit:
         Compute the power
         :return: nothing, the results are stored in the class
         """
-
-        # load
-        self.Sbus = - self.C_bus_load * (self.load_s * self.load_active).T  # MW
-
-        # static generators
-        self.Sbus += self.C_bus_static_generator * (self.static_generator_s * self.static_generator_active).T  # MW
-
-        # generators
-        self.Sbus += self.C_bus_gen * (self.get_generator_injections() * self.generator_active).T
-
-        # battery
-        self.Sbus += self.C_bus_batt * (self.get_battery_injections() * self.battery_active).T
-
-        # HVDC forced power
-        if self.nhvdc:
-            self.Sbus += ((self.hvdc_active * self.hvdc_Pf) * self.C_hvdc_bus_f).T
-            self.Sbus += ((self.hvdc_active * self.hvdc_Pt) * self.C_hvdc_bus_t).T
-
-        self.Sbus /= self.Sbase
+        self.Sbus = self.get_power_injections(normalize=True)
 
     def compute_reactive_power_limits(self):
         """
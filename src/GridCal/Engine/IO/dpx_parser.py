@@ -13,7 +13,13 @@
 # You should have received a copy of the GNU General Public License
 # along with GridCal.  If not, see <http://www.gnu.org/licenses/>.
 
-
+import io
+import os
+import re
+import csv
+import json
+import mmap
+import codecs
 import chardet
 
 from GridCal.Engine.basic_structures import Logger
@@ -27,6 +33,22 @@ pd.set_option('display.width', 1000)
 
 __headers__ = dict()
 
+# blocks whose lines start with a marker that further categorizes them
+__blocks_with_marker__ = ['CatalogNode', 'CatalogBranch', 'Areas', 'Sites', 'Nodes', 'Branches']
+
+# blocks without further categorization
+__blocks_without_marker__ = ['CatalogUGen', 'Parameters']
+
+# block separator lines start with the block name followed by a colon
+__dpx_header__ = re.compile(rb'[A-Za-z][A-Za-z0-9_]*:')
+
+# runs of blanks next to the tabs and line breaks that separate the cells
+# (lookarounds instead of capturing the separator, so that the replacement is a plain empty string)
+__dpx_blanks__ = re.compile(rb'[ \r\x0b\x0c]+(?=[\t\n])|(?<=[\t\n])[ \r\x0b\x0c]+')
+
+# version of the index files saved next to the DPX files (increase it whenever their contents change)
+__dpx_index_version__ = 1
+
 
 ########################################################################################################################
 # CatalogBranch block
@@ -218,6 +240,243 @@ def reformat(val):
     return x
 
 
+def detect_encoding(fp, sample_size=65536):
+    """
+    Guess the encoding of a binary file object from the beginning of the file
+    :param fp: file object opened in binary mode (it is rewound after sampling)
+    :param sample_size: maximum number of bytes used for the guess
+    :return: encoding name
+    """
+    sample = fp.read(sample_size)
+
+    # a byte order mark settles the question without any statistics
+    # (the UTF-32 marks must go first since BOM_UTF32_LE starts with BOM_UTF16_LE)
+    for bom, encoding in [(codecs.BOM_UTF8, 'utf-8-sig'),
+                          (codecs.BOM_UTF32_LE, 'utf-32'),
+                          (codecs.BOM_UTF32_BE, 'utf-32'),
+                          (codecs.BOM_UTF16_LE, 'utf-16'),
+                          (codecs.BOM_UTF16_BE, 'utf-16')]:
+        if sample.startswith(bom):
+            fp.seek(0)
+            return encoding
+
+    # without a byte order mark, UTF-16 and UTF-32 are told apart by the zero bytes of the (mostly ASCII) characters
+    # (the statistical detector may take them for binary data)
+    n = len(sample) // 4
+    if n > 0 and sample.count(0) > n:
+        zeros = [sample[i:4 * n:4].count(0) > 0.9 * n for i in range(4)]
+        for pattern, encoding in [([False, True, True, True], 'utf-32-le'),
+                                  ([True, True, True, False], 'utf-32-be'),
+                                  ([False, True, False, True], 'utf-16-le'),
+                                  ([True, False, True, False], 'utf-16-be')]:
+            if zeros == pattern:
+                fp.seek(0)
+                return encoding
+
+    # feed the detector with the beginning of the file only (starting at an arbitrary point could split a
+    # multi-byte character and mislead it, and some chardet versions are never sure of plain ASCII,
+    # so feeding until it is done could mean feeding the whole file)
+    detector = chardet.UniversalDetector()
+    detector.feed(sample)
+    detector.close()
+
+    fp.seek(0)
+
+    encoding = detector.result['encoding']
+
+    if encoding is None or encoding == 'ascii':
+        # plain ASCII is read the same as utf-8
+        return 'utf-8'
+    else:
+        return encoding
+
+
+def is_ascii_compatible(encoding):
+    """
+    Check if an encoding writes the ASCII characters as ASCII bytes, so that its bytes can be scanned directly
+    (UTF-16 and UTF-32 in any of their variants do not)
+    :param encoding: encoding name
+    :return: True / False
+    """
+    try:
+        return b'Ab:\t\n,'.decode(encoding) == 'Ab:\t\n,'
+    except UnicodeDecodeError:
+        return False
+
+
+def decode_dpx_line(raw, encoding):
+    """
+    Decode a line of a DPX file
+    :param raw: bytes of the line
+    :param encoding: encoding of the file
+    :return: string
+    """
+    if raw.isascii():
+        # the usual case, and much cheaper than the general codec
+        return raw.decode('ascii')
+    else:
+        return raw.decode(encoding)
+
+
+def strip_dpx_cells(data):
+    """
+    Remove the blanks at the beginning and end of every cell of the DPX data
+    :param data: bytes of tab separated data lines
+    :return: bytes
+    """
+    # whole runs are removed in a single pass, however wide the padding of the cells
+    return __dpx_blanks__.sub(b'', data).strip(b' \r\x0b\x0c')
+
+
+def parse_dpx_block(data, n_fields, encoding):
+    """
+    Parse the data lines of a DPX block in one go with the pandas C tokenizer
+    :param data: bytes of the data lines of the block
+    :param n_fields: number of tab separated fields of each line
+    :param encoding: encoding of the file
+    :return: list of rows (lists of strings), each row with its own original length
+    """
+    # remove the commas (mere decoration), then the blanks surrounding the cells,
+    # and then the quotes (not used consistently)
+    data = strip_dpx_cells(data.translate(None, b',')).translate(None, b"'")
+
+    df = pd.read_csv(io.BytesIO(data),
+                     sep='\t',
+                     header=None,
+                     names=range(max(n_fields)),
+                     dtype=str,
+                     quoting=csv.QUOTE_NONE,
+                     na_filter=False,
+                     encoding=encoding,
+                     engine='c')
+
+    # truncate the rows padded by pandas, so that repack sees the lines as they were
+    return [row[:n] for row, n in zip(df.values.tolist(), n_fields)]
+
+
+def scan_dpx_blocks(buffer, encoding):
+    """
+    Split the lines of a DPX file into blocks
+    :param buffer: binary file-like object with the contents of the file
+    :param encoding: encoding of the file (ASCII compatible)
+    :return: byte ranges of the data lines of each block, number of fields of each of those lines, log messages
+    """
+    block_spans = dict()
+    block_n_fields = dict()
+    messages = list()
+
+    current_block = None
+
+    # skip the UTF-8 byte order mark, or the first block separator would not be recognized
+    if buffer.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8:
+        start = len(codecs.BOM_UTF8)
+    else:
+        buffer.seek(0)
+        start = 0
+
+    for raw in iter(buffer.readline, b''):
+        end = start + len(raw)
+
+        if raw.isspace():
+            # empty lines carry nothing
+            pass
+
+        elif __dpx_header__.match(raw) and b',' not in raw:
+            # block separators
+            vals = raw.split(b':')
+            current_block = decode_dpx_line(vals[0], encoding)
+
+        else:
+            # Data
+            n = raw.count(b'\t') + 1
+
+            if n > 1:
+
+                if current_block in __blocks_with_marker__ or current_block in __blocks_without_marker__:
+
+                    # check the if the block has been created
+                    if current_block not in block_spans.keys():
+                        block_spans[current_block] = list()
+                        block_n_fields[current_block] = list()
+
+                    spans = block_spans[current_block]
+                    if len(spans) and spans[-1][1] == start:
+                        # consecutive lines are a single range
+                        spans[-1][1] = end
+                    else:
+                        spans.append([start, end])
+
+                    block_n_fields[current_block].append(n)
+
+                else:
+                    messages.append('Unknown block: ' + str(current_block))
+
+            else:
+                messages.append('Unrecognized line: ' + decode_dpx_line(raw, encoding))
+
+        start = end
+
+    return block_spans, block_n_fields, messages
+
+
+def load_dpx_index(file_name, stat):
+    """
+    Load the index saved next to a DPX file by a previous read, if the file has not changed since
+    :param file_name: DPX file name
+    :param stat: os.stat result of the DPX file
+    :return: index dictionary or None
+    """
+    try:
+        with open(file_name + '.idx', 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(index, dict) or index.get('version') != __dpx_index_version__:
+        return None
+
+    elif any(key not in index for key in ['encoding', 'spans', 'n_fields', 'messages']):
+        return None
+
+    elif not isinstance(index['spans'], dict) or not isinstance(index['n_fields'], dict):
+        return None
+
+    elif set(index['spans']) != set(index['n_fields']):
+        # every block needs both its lines and their number of fields
+        return None
+
+    elif index.get('size') == stat.st_size and index.get('mtime') == stat.st_mtime_ns:
+        return index
+
+    else:
+        return None
+
+
+def save_dpx_index(file_name, stat, encoding, block_spans, block_n_fields, messages):
+    """
+    Save the encoding and the blocks of a DPX file next to it, to skip their detection when it is read again
+    :param file_name: DPX file name
+    :param stat: os.stat result of the DPX file
+    :param encoding: detected encoding of the file
+    :param block_spans: byte ranges of the data lines of each block
+    :param block_n_fields: number of fields of each data line of each block
+    :param messages: log messages of the scan
+    """
+    index = {'version': __dpx_index_version__,
+             'size': stat.st_size,
+             'mtime': stat.st_mtime_ns,
+             'encoding': encoding,
+             'spans': block_spans,
+             'n_fields': block_n_fields,
+             'messages': messages}
+    try:
+        with open(file_name + '.idx', 'w') as f:
+            json.dump(index, f)
+    except OSError:
+        # the index is just a shortcut (i.e. the folder may be read only)
+        pass
+
+
 def read_dpx_data(file_name):
     """
     Read the DPX file into a structured dictionary
@@ -228,72 +487,78 @@ def read_dpx_data(file_name):
 
     structures_dict = dict()
 
-    current_block = None
+    stat = os.stat(file_name)
 
-    # make a guess of the file encoding
-    detection = chardet.detect(open(file_name, "rb").read())
+    # a previous read may have left the encoding and the blocks of the file already figured out
+    index = load_dpx_index(file_name, stat)
 
-    # parse the data into the structures
-    with open(file_name, 'r', encoding=detection['encoding']) as f:
-        for line in f:
+    with open(file_name, 'rb') as fp:
 
-            if ':' in line and ',' not in line:
-                # block separators
-                vals = line.split(':')
-                current_block = vals[0]
-
-            else:
-                # Data
+        if index is None:
+            # make a guess of the file encoding using only the beginning of the file
+            file_encoding = detect_encoding(fp)
+        else:
+            file_encoding = index['encoding']
 
-                values = line.replace(",", "").split('\t')
+        if not is_ascii_compatible(file_encoding):
+            # the bytes can only be scanned in an ASCII compatible encoding
+            buffer = io.BytesIO(fp.read().decode(file_encoding).encode('utf-8'))
+            view = buffer.getvalue()
+            encoding = 'utf-8'
 
-                if len(values) > 1:
+        elif stat.st_size > 0:
+            # map the file instead of reading it, the blocks are sliced from here directly
+            buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            view = buffer
+            encoding = file_encoding
 
-                    if current_block in ['CatalogNode', 'CatalogBranch', 'Areas', 'Sites', 'Nodes',
-                                         'Branches']:  # blocks with further categorization
+        else:
+            return structures_dict, logger
 
-                        # check the if the block has been created
-                        if current_block not in structures_dict.keys():
-                            structures_dict[current_block] = dict()
+        # split the file into blocks
+        if index is None:
+            block_spans, block_n_fields, messages = scan_dpx_blocks(buffer, encoding)
+        else:
+            block_spans, block_n_fields, messages = index['spans'], index['n_fields'], index['messages']
 
-                        marker = values[0]
-                        data = [reformat(val.strip().replace("'", "")) for val in values[1:]]
-                        if marker not in structures_dict[current_block].keys():
-                            # structures_dict[current_block][marker] = DPXbase(tpe=marker)
-                            structures_dict[current_block][marker] = list()
+        for msg in messages:
+            logger.append(msg)
 
-                        # add the data
-                        structures_dict[current_block][marker].append(data)
+        # parse the data into the structures
+        for current_block, spans in block_spans.items():
 
-                    elif current_block in ['CatalogUGen', 'Parameters']:  # blocks without further categorization
+            data = b''.join([view[a:b] for a, b in spans])
 
-                        # check the if the block has been created
-                        if current_block not in structures_dict.keys():
-                            structures_dict[current_block] = list()
+            rows = parse_dpx_block(data=data, n_fields=block_n_fields[current_block], encoding=encoding)
 
-                        # correct the values
-                        data = [reformat(val.strip().replace("'", "")) for val in values]
+            if current_block in __blocks_with_marker__:
+                # the first value of each row is the marker that further categorizes the data
+                markers = pd.Series([row[0] for row in rows])
+                structures_dict[current_block] = {marker: [rows[i][1:] for i in idx]
+                                                  for marker, idx in markers.groupby(markers, sort=False).indices.items()}
 
-                        # insert the data
-                        structures_dict[current_block].append(data)
+            else:
+                structures_dict[current_block] = rows
 
-                    else:
-                        # append an entry to the logger
-                        logger.append('Unknown block: ' + current_block)
+        buffer.close()
 
-                else:
-                    logger.append('Unrecognized line: ' + line)
+    if index is None:
+        # the blocks are only worth remembering once they have been parsed successfully
+        save_dpx_index(file_name, stat, file_encoding, block_spans, block_n_fields, messages)
 
     return structures_dict, logger
 
 
-def repack(data_structures, logger=Logger(), verbose=False):
+def repack(data_structures, logger=None, verbose=False):
     """
     Pack the values as DataFrames with headers where available
     :param data_structures: Raw data structures
     :param logger: logger (inherited)
     :return:
     """
+    if logger is None:
+        logger = Logger()
+
     for current_block in data_structures.keys():
 
         # parse the data
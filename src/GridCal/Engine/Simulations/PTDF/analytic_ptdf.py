@@ -19,6 +19,7 @@ from PySide2.QtCore import QThread, Signal
 import numpy as np
 import scipy.sparse as sp
 from scipy.sparse.linalg import spsolve
+from scipy.linalg.blas import get_blas_funcs
 
 from GridCal.Engine.basic_structures import Logger
 from GridCal.Engine.Core.multi_circuit import MultiCircuit
@@ -215,9 +216,10 @@ class LinearAnalysis:
                                              bus_names=[],
                                              bus_types=[])
 
-    def run(self):
+    def run(self, with_lodf=True):
         """
         Run the PTDF and LODF
+        :param with_lodf: compute the LODF as well? (it is not needed to compute the flows)
         """
         self.numerical_circuit = compile_snapshot_circuit(self.grid)
         islands = split_into_islands(self.numerical_circuit)
@@ -258,21 +260,38 @@ class LinearAnalysis:
                                           distribute_slack=self.distributed_slack)
 
         # the LODF algorithm doesn't seem to solve any circuit, hence there is no need of island splitting
-        self.results.LODF = make_lodf(Cf=self.numerical_circuit.C_branch_bus_f,
-                                      Ct=self.numerical_circuit.C_branch_bus_t,
-                                      PTDF=self.results.PTDF,
-                                      correct_values=self.correct_values)
+        if with_lodf:
+            self.results.LODF = make_lodf(Cf=self.numerical_circuit.C_branch_bus_f,
+                                          Ct=self.numerical_circuit.C_branch_bus_t,
+                                          PTDF=self.results.PTDF,
+                                          correct_values=self.correct_values)
 
-    def get_branch_time_series(self, Sbus):
+    def get_branch_time_series(self, Sbus, out=None):
         """
         Compute the time series PTDF
-        :param Sbus: Power injections time series array
-        :return:
+        :param Sbus: Power injections time series array (buses x time)
+        :param out: Optional C-contiguous array (time x branches) where to write the flows
+        :return: Branch flows time series array (time x branches)
         """
 
         # option 2: call the power directly
         P = Sbus.real
         PTDF = self.results.PTDF
-        Pbr = np.dot(PTDF, P).T * self.grid.Sbase
+
+        # call the BLAS matrix product of the precision of the data directly, with the base power as scaling factor
+        gemm = get_blas_funcs('gemm', (PTDF, P))
+
+        # BLAS works in Fortran order: the transposed (time, branch) C arrays are (branch, time) Fortran
+        # arrays, so the flows of all the time steps are written in place as PTDF x P
+        Pbr = gemm(alpha=self.grid.Sbase,
+                   a=PTDF.T,
+                   b=P,
+                   trans_a=True,
+                   c=None if out is None else out.T,
+                   overwrite_c=True).T
+
+        if out is not None and not np.may_share_memory(Pbr, out):
+            # out was not usable by BLAS as it is (i.e. a different precision)
+            out[:, :] = Pbr
 
         return Pbr
@@ -28,13 +28,16 @@ from GridCal.Engine.Core.snapshot_pf_data import compile_snapshot_circuit, split
 
 class LinearAnalysisOptions:
 
-    def __init__(self, distribute_slack=True):
+    def __init__(self, distribute_slack=True, use_float32=False):
         """
         Power Transfer Distribution Factors' options
         :param distribute_slack:
+        :param use_float32: compute the time series flows in single precision (faster, but less precise)
         """
         self.distribute_slack = distribute_slack
 
+        self.use_float32 = use_float32
+
 
 class LinearAnalysisDriver(QThread):
     progress_signal = Signal(float)
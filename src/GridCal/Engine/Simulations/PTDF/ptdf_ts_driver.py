@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with GridCal.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
 import json
 import pandas as pd
 import numpy as np
@@ -20,6 +21,11 @@ import scipy.sparse as sp
 from scipy.sparse.linalg import spsolve, factorized
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from PySide2.QtCore import QThread, Signal
 
 from GridCal.Engine.basic_structures import Logger
@@ -74,25 +80,38 @@ class PtdfTimeSeriesResults:
     def get_results_dict(self):
         """
         Returns a dictionary with the results sorted in a dictionary
-        :return: dictionary of 2D numpy arrays (probably of complex numbers)
+        :return: dictionary of 2D numpy arrays (the PTDF results are real, there is no reactive part)
         """
-        data = {'V': self.voltage.tolist(),
-                'P': self.S.real.tolist(),
-                'Q': self.S.imag.tolist(),
-                'Sbr_real': self.Sbranch.real.tolist(),
-                'Sbr_imag': self.Sbranch.imag.tolist(),
-                'loading': np.abs(self.loading).tolist()}
+        data = {'V': self.voltage,
+                'P': self.S,
+                'Sbr_real': self.Sbranch,
+                'loading': np.abs(self.loading)}
         return data
 
     def save(self, file_name):
         """
-        Export as json
+        Export as a compressed numpy file if the file name ends with .npz, otherwise as json
         :param file_name: Name of the file
         """
+        data = self.get_results_dict()
+
+        if os.path.splitext(file_name)[1].lower() == '.npz':
+            # binary arrays, to be read back with np.load
+            np.savez_compressed(file_name, **data)
+
+        else:
+            # single precision is plenty for reporting, so the values are the same with or without orjson
+            # (only their text differs: json prints each float32 value with the digits of a double)
+            data = {key: np.ascontiguousarray(value, dtype=np.float32) for key, value in data.items()}
+
+            if orjson is not None:
+                # orjson walks the arrays in C
+                json_bytes = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+            else:
+                json_bytes = json.dumps({key: value.tolist() for key, value in data.items()}).encode()
 
-        with open(file_name, "wb") as output_file:
-            json_str = json.dumps(self.get_results_dict())
-            output_file.write(json_str)
+            with open(file_name, "wb") as output_file:
+                output_file.write(json_bytes)
 
     def mdl(self, result_type: ResultTypes) -> "ResultsModel":
         """
@@ -109,7 +128,7 @@ class PtdfTimeSeriesResults:
 
         elif result_type == ResultTypes.BranchActivePower:
             labels = self.branch_names
-            data = self.Sbranch.real
+            data = self.Sbranch
             y_label = '(MW)'
             title = 'Branch power '
 
@@ -214,15 +233,41 @@ class PtdfTimeSeries(QThread):
 
         self.progress_text.emit('Computing PTDF...')
         ptdf_analysis = LinearAnalysis(grid=self.grid, distributed_slack=self.options.distribute_slack)
-        ptdf_analysis.run()
+        ptdf_analysis.run(with_lodf=False)
 
         self.progress_text.emit('Computing branch flows...')
 
-        Pbus_0 = ts_numeric_circuit.get_power_injections().real[:, time_indices]
-        self.results.Sbranch = ptdf_analysis.get_branch_time_series(Pbus_0)
+        # single precision halves the memory traffic of the products, and is enough for screening purposes
+        if self.options.use_float32:
+            dtype = np.float32
+            ptdf_analysis.results.PTDF = ptdf_analysis.results.PTDF.astype(dtype)
+        else:
+            dtype = np.float64
+
+        Pbus_0 = ts_numeric_circuit.get_power_injections().real[:, time_indices].astype(dtype, copy=False)
+        nt = len(time_indices)
+        self.results.Sbranch = np.zeros((nt, ts_numeric_circuit.nbr), dtype=dtype)
+
+        # the time steps are computed in about 10 blocks, so that the progress is reported every 10 %,
+        # but no narrower than 512 steps, so that the products stay efficient (a single one for short series)
+        block_size = max(512, -(-nt // 10))
+
+        # the blocks run one after the other: BLAS already uses all the cores in each product
+        for t0 in range(0, nt, block_size):
+            t1 = min(t0 + block_size, nt)
+
+            # the flows are written directly into the results
+            ptdf_analysis.get_branch_time_series(Pbus_0[:, t0:t1], out=self.results.Sbranch[t0:t1, :])
+
+            self.progress_signal.emit(t1 / nt * 100)
+            self.progress_text.emit('Computing branch flows at ' + str(self.indices[t1 - 1]))
+
+            if self.__cancel__:
+                break
 
-        # compute post process
-        self.results.loading = self.results.Sbranch / (ptdf_analysis.numerical_circuit.branch_rates + 1e-9)
+        # compute post process (the rates are inverted once, and the flows of every time step multiplied)
+        inv_rates = (1.0 / (ptdf_analysis.numerical_circuit.branch_rates + 1e-9)).astype(dtype, copy=False)
+        self.results.loading = self.results.Sbranch * inv_rates
         self.results.S = Pbus_0.T
 
         self.elapsed = time.time() - a
@@ -213,6 +213,9 @@ setup(
     #     'dev': ['check-manifest'],
     #     'test': ['coverage'],
     # },
+    extras_require={
+        'fast_json': ['orjson'],  # faster json export of the time series results
+    },
 
     # If there are data files included in your packages that need to be
     # installed, specify them here.
@@ -0,0 +1,99 @@
+# This file is part of GridCal.
+#
+# GridCal is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GridCal is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GridCal.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark of the DPX reader against the former line by line reader
+
+run: python benchmark_dpx.py [number of rows]
+"""
+import os
+import sys
+import time
+import tempfile
+import chardet
+
+from GridCal.Engine.IO.dpx_parser import read_dpx_data, reformat
+
+
+def read_dpx_data_per_line(file_name):
+    """
+    Former DPX reader, parsing every line and every cell in python (reference for the benchmark)
+    :param file_name: DPX file name
+    :return: structures dictionary
+    """
+    structures_dict = dict()
+    current_block = None
+    detection = chardet.detect(open(file_name, "rb").read())
+    with open(file_name, 'r', encoding=detection['encoding']) as f:
+        for line in f:
+            if ':' in line and ',' not in line:
+                current_block = line.split(':')[0]
+            else:
+                values = line.replace(",", "").split('\t')
+                if len(values) > 1:
+                    if current_block in ['CatalogNode', 'CatalogBranch', 'Areas', 'Sites', 'Nodes', 'Branches']:
+                        if current_block not in structures_dict.keys():
+                            structures_dict[current_block] = dict()
+                        marker = values[0]
+                        data = [reformat(val.strip().replace("'", "")) for val in values[1:]]
+                        if marker not in structures_dict[current_block].keys():
+                            structures_dict[current_block][marker] = list()
+                        structures_dict[current_block][marker].append(data)
+                    elif current_block in ['CatalogUGen', 'Parameters']:
+                        if current_block not in structures_dict.keys():
+                            structures_dict[current_block] = list()
+                        structures_dict[current_block].append([reformat(val.strip().replace("'", ""))
+                                                               for val in values])
+    return structures_dict
+
+
+def write_dpx(file_name, n_rows, padding=0):
+    """
+    Write a synthetic DPX file
+    :param file_name: file name
+    :param n_rows: number of data rows
+    :param padding: number of spaces around the cells of the branches
+    """
+    p = ' ' * padding
+    with open(file_name, 'w', encoding='latin-1') as f:
+        f.write('Nodes:\n')
+        for i in range(n_rows // 2):
+            f.write("PT,\t'{0}',\t'Nó {0}',\t15.0,\t{1},\t{2},\t0,\t0,\t1,\t0.9,\t1.1\n".format(i, i * 3, i * 2))
+        f.write('Branches:\n')
+        for i in range(n_rows - n_rows // 2):
+            f.write("LINE,\t{2}'L{0}'{2},\t{2}'Line {0}'{2},\t{2}'{0}'{2},\t{2}'{1}'{2},\t1,\t0,\t0.1,\t3.5,\t1\n".format(
+                i, i + 1, p))
+
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+
+    for padding in [0, 12, 24]:
+        with tempfile.TemporaryDirectory() as folder:
+            fname = os.path.join(folder, 'benchmark.dpx')
+            write_dpx(fname, n, padding)
+            print('File of', n, 'rows,', padding, 'spaces of padding,', round(os.path.getsize(fname) / 1e6, 1), 'MB')
+
+            a = time.time()
+            read_dpx_data_per_line(fname)
+            print('line by line reader:', round(time.time() - a, 2), 's')
+
+            a = time.time()
+            read_dpx_data(fname)
+            print('reader:', round(time.time() - a, 2), 's')
+
+            a = time.time()
+            read_dpx_data(fname)
+            print('reader (indexed):', round(time.time() - a, 2), 's')
@@ -0,0 +1,96 @@
+# This file is part of GridCal.
+#
+# GridCal is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GridCal is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GridCal.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import json
+import codecs
+
+from GridCal.Engine.IO.dpx_parser import read_dpx_data
+
+
+def write_dpx_copy(root_path, folder, name, encoding, bom=b''):
+    """
+    Write a copy of the test DPX file with another encoding
+    :param root_path: tests folder
+    :param folder: destination folder
+    :param name: destination file name
+    :param encoding: encoding of the copy
+    :param bom: byte order mark to prepend
+    :return: path of the copy
+    """
+    text = (root_path / 'data' / 'test.dpx').read_bytes().decode('utf-8')
+    file_name = folder / name
+    file_name.write_bytes(bom + text.encode(encoding))
+    return str(file_name)
+
+
+def test_dpx_utf8_bom(root_path, tmp_path):
+    plain, _ = read_dpx_data(write_dpx_copy(root_path, tmp_path, 'plain.dpx', 'utf-8'))
+    bom, _ = read_dpx_data(write_dpx_copy(root_path, tmp_path, 'bom.dpx', 'utf-8', codecs.BOM_UTF8))
+
+    # the first block follows the byte order mark
+    assert bom['Parameters'] == [['Sb', '100', 'MVA']]
+    assert bom == plain
+
+
+def test_dpx_encodings(root_path, tmp_path):
+    plain, _ = read_dpx_data(write_dpx_copy(root_path, tmp_path, 'plain.dpx', 'utf-8'))
+
+    assert plain['Parameters'] == [['Sb', '100', 'MVA']]
+    assert plain['Nodes']['PT'][0] == ['N1', 'Nó 1', '15.0', '0', '0']
+    assert plain['Nodes']['LOAD'] == [['L1', ' X1 ', '0.4']]
+    assert len(plain['Branches']['LINE']) == 2
+
+    # the cells padded with blanks come back trimmed
+    assert plain['Branches']['LINE'][1] == ['B2', 'Line 2', 'N2', 'N3', '1', '0.2', '1.5']
+
+    for name, encoding, bom in [('bom.dpx', 'utf-8', codecs.BOM_UTF8),
+                                ('utf16.dpx', 'utf-16', b''),
+                                ('utf16le.dpx', 'utf-16-le', b''),
+                                ('utf16be.dpx', 'utf-16-be', b'')]:
+        file_name = write_dpx_copy(root_path, tmp_path, name, encoding, bom)
+
+        # the first read scans the file, the second one uses the index saved by the first
+        data, _ = read_dpx_data(file_name)
+        assert os.path.exists(file_name + '.idx')
+        data2, _ = read_dpx_data(file_name)
+
+        assert data == plain
+        assert data2 == plain
+
+
+def test_dpx_index_incomplete(root_path, tmp_path):
+    file_name = write_dpx_copy(root_path, tmp_path, 'plain.dpx', 'utf-8')
+    data, _ = read_dpx_data(file_name)
+
+    # an index without the blocks, with blocks lacking their number of fields, or from another version,
+    # must be ignored
+    with open(file_name + '.idx', 'r') as f:
+        index = json.load(f)
+    n_fields = {block: n for block, n in index['n_fields'].items() if block != 'Nodes'}
+    for key, value in [('spans', None), ('n_fields', n_fields), ('version', -1)]:
+        with open(file_name + '.idx', 'w') as f:
+            json.dump({k: v for k, v in index.items() if k != key} if value is None else {**index, key: value}, f)
+
+        data2, _ = read_dpx_data(file_name)
+        assert data2 == data
+
+
+if __name__ == '__main__':
+    from pathlib import Path
+    import tempfile
+    with tempfile.TemporaryDirectory() as folder:
+        test_dpx_utf8_bom(Path(__file__).parent, Path(folder))
+        test_dpx_encodings(Path(__file__).parent, Path(folder))
+        test_dpx_index_incomplete(Path(__file__).parent, Path(folder))
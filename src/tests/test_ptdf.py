@@ -43,5 +43,37 @@ def test_ptdf():
     return True
 
 
+def test_ptdf_time_series(tmp_path):
+    fname = os.path.join('..', '..', 'Grids_and_profiles', 'grids', 'IEEE39_1W.gridcal')
+    main_circuit = FileOpen(fname).open()
+    nt = len(main_circuit.time_profile)
+
+    results = dict()
+    for use_float32 in [False, True]:
+        options = LinearAnalysisOptions(use_float32=use_float32)
+        simulation = PtdfTimeSeries(grid=main_circuit, options=options, start_=0, end_=nt)
+        simulation.run()
+        results[use_float32] = simulation.results
+
+    res64 = results[False]
+    res32 = results[True]
+
+    assert res64.Sbranch.dtype == np.float64
+    assert res32.Sbranch.dtype == np.float32
+    assert res64.Sbranch.shape == (nt, len(res64.branch_names))
+
+    # single precision is only meant for screening, so the flows must be close but not exact
+    tol = 1e-4 * np.max(np.abs(res64.Sbranch))
+    assert np.max(np.abs(res32.Sbranch - res64.Sbranch)) < tol
+    assert np.max(np.abs(res32.loading - res64.loading)) < 1e-4 * np.max(np.abs(res64.loading))
+
+    # the results saved as .npz read back untouched
+    file_name = str(tmp_path / 'ptdf_ts.npz')
+    res64.save(file_name)
+    data = np.load(file_name)
+    for key, value in res64.get_results_dict().items():
+        assert np.array_equal(data[key], value)
+
+
 if __name__ == '__main__':
     test_ptdf()